@@ -0,0 +1,25 @@
+"""Index invoices by status
+
+Revision ID: b3d7e1f0c2a4
+Revises: 8f2c0c3e1aa9
+Create Date: 2026-10-16 13:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3d7e1f0c2a4'
+down_revision: Union[str, Sequence[str], None] = '8f2c0c3e1aa9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Status counts and pending-invoice lookups filter/group on this column
+    op.create_index(op.f('ix_invoices_status'), 'invoices', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_invoices_status'), table_name='invoices')
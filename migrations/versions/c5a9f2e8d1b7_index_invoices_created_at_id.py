@@ -0,0 +1,24 @@
+"""Index invoices by (created_at, id) for keyset pagination
+
+Revision ID: c5a9f2e8d1b7
+Revises: b3d7e1f0c2a4
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5a9f2e8d1b7'
+down_revision: Union[str, Sequence[str], None] = 'b3d7e1f0c2a4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_invoices_created_at_id', 'invoices', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_invoices_created_at_id', table_name='invoices')
@@ -1,4 +1,5 @@
 import logging
+import structlog
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
@@ -7,9 +8,21 @@ from typing import AsyncGenerator
 from src.core.config import Config
 from src.api.routers import health, invoices, dbisam
 from src.db.session import init_db
+from src.services.zatca_production import close_zatca_service, init_zatca_service
 
 logger = logging.getLogger("uvicorn.error")
 
+# Drop structlog records below LOG_LEVEL in the bound logger itself, before any processor runs
+log_level = logging.getLevelNamesMapping().get(Config.LOG_LEVEL.upper())
+if log_level is None:
+    logger.warning("Unknown LOG_LEVEL %r, falling back to INFO", Config.LOG_LEVEL)
+    log_level = logging.INFO
+
+structlog.configure(
+    wrapper_class=structlog.make_filtering_bound_logger(log_level),
+    cache_logger_on_first_use=True,
+)
+
 
 @asynccontextmanager
 async def life_span(app: FastAPI) -> AsyncGenerator[None, None]:
@@ -21,10 +34,18 @@ async def life_span(app: FastAPI) -> AsyncGenerator[None, None]:
         logger.exception("Database initialization failed: %s", e)
         raise
 
+    # Not fatal: the service stays unset, so the first ZATCA call retries and reports the error
+    try:
+        await init_zatca_service()
+        logger.info("ZATCA service initialization finished.")
+    except Exception as e:
+        logger.exception("ZATCA service initialization failed: %s", e)
+
     try:
         yield
     finally:
         logger.info("Shutting down application lifespan.")
+        await close_zatca_service()
 
 
 api_str = getattr(Config, "API_STR", "/api")
@@ -1,6 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel.ext.asyncio.session import AsyncSession
+from datetime import datetime
 from typing import Dict, List
+from uuid import UUID
 from src.db.models.invoices import InvoiceStatus, Invoice
 from src.schemas.invoices import CountOut, ZakatUploadResult, ImportResult, ZakatProcessResult
 from src.db.session import get_session
@@ -31,9 +33,12 @@ async def list_invoices(
     limit: int = Query(10, ge=1, le=100),
     offset: int = Query(0, ge=0),
     status: InvoiceStatus | None = Query(None),
+    after_created_at: datetime | None = Query(None, description="created_at of the last invoice on the previous page"),
+    after_id: UUID | None = Query(None, description="id of the last invoice on the previous page"),
     session: AsyncSession = Depends(get_session)
 ) -> List[Invoice]:
-    return await invoices_services.get_invoices(session, limit=limit, offset=offset, status=status)
+    cursor = (after_created_at, after_id) if after_created_at is not None and after_id is not None else None
+    return await invoices_services.get_invoices(session, limit=limit, offset=offset, status=status, cursor=cursor)
 
 @router.post('/import', response_model=ImportResult)
 async def import_invoices(session: AsyncSession = Depends(get_session)) -> Dict[str, int]:
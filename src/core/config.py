@@ -6,6 +6,7 @@ class Settings(BaseSettings):
     # API
     API_STR: str = "/api"
     PREFIX: str = ""
+    LOG_LEVEL: str = "INFO"
 
     # Databases
     DB_URL: str
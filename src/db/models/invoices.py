@@ -3,7 +3,7 @@ from datetime import datetime
 from decimal import Decimal
 from sqlmodel import Field, Relationship, Column, String
 import sqlalchemy.dialects.postgresql as pg
-from sqlalchemy import ForeignKey
+from sqlalchemy import ForeignKey, Index
 from uuid import UUID, uuid4
 from enum import Enum
 
@@ -15,6 +15,10 @@ class InvoiceStatus(str, Enum):
 
 class Invoice(Base, table=True):
     __tablename__ = "invoices"
+    __table_args__ = (
+        # Supports newest-first keyset pagination on (created_at, id)
+        Index("ix_invoices_created_at_id", "created_at", "id"),
+    )
 
     id: UUID = Field(sa_column=Column(pg.UUID, primary_key=True, unique=True, default=uuid4))
     invoice_number: str = Field(sa_column=Column(String(255), nullable=False, unique=True))
@@ -32,6 +36,7 @@ class Invoice(Base, table=True):
         sa_column=Column(
             pg.ENUM(InvoiceStatus, name="invoice_status_enum", create_type=True),
             nullable=False,
+            index=True,
         )
     )
     # ZATCA integration fields
@@ -16,6 +16,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 
+import orjson
 import structlog
 
 logger = structlog.get_logger(__name__)
@@ -439,8 +440,7 @@ async def main():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     results_file = f"zatca_comprehensive_test_results_{timestamp}.json"
     
-    with open(results_file, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    Path(results_file).write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     
     # Print comprehensive summary
     if "summary" in results:
@@ -3,6 +3,7 @@ import pandas as pd
 from src.scripts.invoice_id import InvoiceNumberGenerator
 from src.scripts.tax_calc import tax_calc
 from src.scripts.invoice_creator import InvoiceCreator
+from src.services.csv_reader import read_csv
 folder_path = os.path.join(os.getcwd(), 'src/scripts/data')
 print(f"Using data folder: {folder_path}")
 
@@ -20,24 +21,15 @@ store = {
     "vat_number": "302008893200003"
 }
 
-_TRY_ENCODINGS = ("utf-8-sig", "cp1256", "latin-1")
 ENDEAVOUR_TAX_RATIO = 0.15
 
-def read_csv_with_fallback(file_path, columns=None):
-    for encoding in _TRY_ENCODINGS:
-        try:
-            return pd.read_csv(file_path, usecols=columns, encoding=encoding)
-        except Exception as e:
-            print(f"Failed to read {file_path} with encoding {encoding}: {e}")
-    raise RuntimeError(f"Could not read {file_path} with any of the tried encodings.")
-
 # Items as dict: {ItemNo: ItemName}
-items_df = read_csv_with_fallback(ITEMS_CSV, columns=["ItemNo", "ItemName"])
+items_df = read_csv(ITEMS_CSV, columns=["ItemNo", "ItemName"])
 items = dict(zip(items_df["ItemNo"], items_df["ItemName"]))
 
 # Entries as list of dicts
 entries = []
-entry_df = read_csv_with_fallback(ENTRY_TAP_CSV, columns=["AccNo", "AmntDB", "ItemNo", "ItemAmnt", "ItemCont"])
+entry_df = read_csv(ENTRY_TAP_CSV, columns=["AccNo", "AmntDB", "ItemNo", "ItemAmnt", "ItemCont"])
 for _, row in entry_df.iterrows():
     entry = {
         "account_num": int(row["AccNo"]) if pd.notna(row["AccNo"]) else None,
@@ -50,7 +42,7 @@ for _, row in entry_df.iterrows():
     entries.append(entry)
 
 indexes = []
-index_df = read_csv_with_fallback(INDEX_ENTRY_TAP_CSV, columns=["RecNo", "DocKnd", "AccNo", "MDate", "Ratio", 'UserName'])
+index_df = read_csv(INDEX_ENTRY_TAP_CSV, columns=["RecNo", "DocKnd", "AccNo", "MDate", "Ratio", 'UserName'])
 for _, row in index_df.iterrows():
     index = {
         "rec_no": int(row["RecNo"]),
@@ -63,7 +55,7 @@ for _, row in index_df.iterrows():
     indexes.append(index)
 
 accounts = {}
-accounts_df = read_csv_with_fallback(ACCOUNTS_CSV, columns=["AccNo", "AccName"])
+accounts_df = read_csv(ACCOUNTS_CSV, columns=["AccNo", "AccName"])
 for _, row in accounts_df.iterrows():
     acc_no = int(row["AccNo"]) if pd. notna(row["AccNo"]) else None
     account = {
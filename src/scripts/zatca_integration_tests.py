@@ -8,13 +8,13 @@ and validates all aspects of the e-invoicing implementation.
 """
 
 import asyncio
-import json
 import os
 import sys
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List
 
+import orjson
 import structlog
 
 # Add src to path for imports
@@ -510,8 +510,7 @@ async def main():
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     results_file = f"zatca_integration_test_results_{timestamp}.json"
     
-    with open(results_file, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    Path(results_file).write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     
     # Print summary
     if "summary" in results:
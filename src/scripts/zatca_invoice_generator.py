@@ -201,8 +201,10 @@ class ZATCAInvoiceGenerator:
     async def create_invoice_in_db(self, session: AsyncSession, invoice_data: Dict, xml: str, enc_xml: str, xml_hash: str) -> Invoice:
         """Create invoice record in PostgreSQL database"""
         
-        # Create main invoice record
+        # Create main invoice record; the primary key is generated client-side so items
+        # can reference it without a flush round-trip before the commit
         invoice = Invoice(
+            id=uuid.uuid4(),
             store_name=invoice_data['store']['name'],
             store_address=invoice_data['store']['address'],
             vat_number=invoice_data['store']['vat_number'],
@@ -220,7 +222,6 @@ class ZATCAInvoiceGenerator:
         )
         
         session.add(invoice)
-        await session.flush()  # Get the ID
         
         # Create invoice items
         for item_data in invoice_data.get('items', []):
@@ -9,7 +9,6 @@ following the official ZATCA sandbox testing procedures.
 
 import asyncio
 import base64
-import json
 import hashlib
 import os
 import sys
@@ -18,6 +17,7 @@ from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 import httpx
+import orjson
 import structlog
 from cryptography import x509
 from cryptography.hazmat.primitives import serialization, hashes
@@ -792,8 +792,7 @@ async def main():
     results = await tester.run_complete_test_suite()
     
     # Save results
-    with open("zatca_sandbox_test_results.json", "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    Path("zatca_sandbox_test_results.json").write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     
     # Print summary
     if "summary" in results:
@@ -10,11 +10,12 @@ to avoid encoding issues while maintaining compliance testing.
 import asyncio
 import base64
 import hashlib
-import json
 import os
 from datetime import datetime
+from pathlib import Path
 from typing import Dict
 
+import orjson
 import structlog
 from cryptography import x509
 from cryptography.hazmat.primitives import serialization, hashes
@@ -245,11 +246,14 @@ class ZATCASimpleTester:
             # Validate XML structure
             xml_validation = self.validate_xml_structure(xml_content)
             
+            # Encode once; the same buffer feeds both the hash and the base64 encoding
+            xml_bytes = xml_content.encode('utf-8')
+            
             # Calculate XML hash
-            xml_hash = hashlib.sha256(xml_content.encode('utf-8')).hexdigest()
+            xml_hash = hashlib.sha256(xml_bytes).hexdigest()
             
             # Encrypt XML (base64 encoding)
-            xml_b64 = base64.b64encode(xml_content.encode('utf-8')).decode('utf-8')
+            xml_b64 = base64.b64encode(xml_bytes).decode('ascii')
             
             # Save XML files
             with open("zatca_simple_output/test_invoice.xml", "w", encoding="utf-8") as f:
@@ -709,8 +713,7 @@ async def main():
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     results_file = f"zatca_simple_test_results_{timestamp}.json"
     
-    with open(results_file, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    Path(results_file).write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
     
     # Print summary
     if "summary" in results:
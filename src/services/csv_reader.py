@@ -0,0 +1,86 @@
+import codecs
+import os
+from functools import lru_cache
+
+import pandas as pd
+import structlog
+
+try:
+    from pyarrow import ArrowInvalid, csv as pacsv
+except ImportError:  # pandas' C parser is used instead
+    pacsv = None
+
+logger = structlog.get_logger(__name__)
+
+TRY_ENCODINGS = ("utf-8-sig", "cp1256", "latin-1")
+SAMPLE_SIZE = 64 * 1024
+ARROW_BLOCK_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=64)
+def _detect_encoding(file_path: str, mtime_ns: int, size: int) -> str:
+    with open(file_path, "rb") as f:
+        sample = f.read(SAMPLE_SIZE)
+    for enc in TRY_ENCODINGS:
+        try:
+            # Incremental decode so a multi-byte character cut at the sample edge is not an error
+            codecs.getincrementaldecoder(enc)().decode(sample, final=False)
+            return enc
+        except UnicodeDecodeError:
+            continue
+    return TRY_ENCODINGS[-1]
+
+
+def detect_encoding(file_path: str) -> str:
+    """Pick the first of TRY_ENCODINGS that decodes the start of the file (cached per file version)"""
+    st = os.stat(file_path)
+    return _detect_encoding(file_path, st.st_mtime_ns, st.st_size)
+
+
+def _read_arrow(file_path: str, columns, header, encoding: str) -> pd.DataFrame:
+    """Multi-threaded block parse with pyarrow.csv, pruning unselected columns before conversion"""
+    no_header = header is None
+    include = None
+    if columns is not None:
+        include = [f"f{c}" for c in columns] if no_header else list(columns)
+
+    table = pacsv.read_csv(
+        file_path,
+        read_options=pacsv.ReadOptions(
+            use_threads=True,
+            block_size=ARROW_BLOCK_SIZE,
+            autogenerate_column_names=no_header,
+            # Arrow skips a UTF-8 BOM itself and only transcodes non-UTF-8 input
+            encoding="utf8" if encoding == "utf-8-sig" else encoding,
+        ),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=include,
+            # Empty cells become NaN as with pandas, not ""
+            strings_can_be_null=True,
+        ),
+    )
+    frame = table.to_pandas()
+    if no_header:
+        # Match pandas' positional column labels for header=None
+        frame.columns = [int(name[1:]) for name in table.column_names]
+    return frame
+
+
+def read_csv(file_path: str, columns=None, header="infer") -> pd.DataFrame:
+    """Parse a CSV once with its detected encoding.
+
+    The remaining encodings (with pandas' C parser) are only tried if that first parse fails,
+    e.g. when a non-UTF-8 byte appears after the sampled prefix.
+    """
+    detected = detect_encoding(file_path)
+    if pacsv is not None:
+        try:
+            return _read_arrow(file_path, columns, header, detected)
+        except (ArrowInvalid, UnicodeDecodeError) as e:
+            logger.debug("pyarrow could not parse CSV, falling back to pandas", file=file_path, error=str(e))
+    for enc in (detected,) + tuple(e for e in TRY_ENCODINGS if e != detected):
+        try:
+            return pd.read_csv(file_path, usecols=columns, encoding=enc, header=header)
+        except Exception:
+            continue
+    raise RuntimeError(f"Unable to read: {file_path}")
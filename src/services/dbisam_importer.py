@@ -1,107 +1,97 @@
-import os
+from pathlib import Path
+
 import pandas as pd
+from sqlalchemy import insert
 from sqlmodel.ext.asyncio.session import AsyncSession
 from src.db.models.dbisam import DBIsamAccount, DBIsamEntry, DBIsamIndexEntry, DBIsamItem
+from src.services.csv_reader import read_csv
 
-# Get the project root directory (where this file is located)
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-ROOT_DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
-TRY_ENCODINGS = ("utf-8-sig", "cp1256", "latin-1")
+# Project root (two levels above src/services/) and the DBISAM export files, resolved once at import
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+ROOT_DATA_DIR = PROJECT_ROOT / "data"
+ACCOUNTS_CSV = ROOT_DATA_DIR / "acctab.csv"
+ITEMS_CSV = ROOT_DATA_DIR / "itemstab.csv"
+ENTRIES_CSV = ROOT_DATA_DIR / "entrytab.csv"
+INDEX_ENTRIES_CSV = ROOT_DATA_DIR / "indexentrytab.csv"
 
 class DBISAMImportService:
-    def _read_csv(self, file_path: str, columns=None, header=None) -> pd.DataFrame:
-        for enc in TRY_ENCODINGS:
-            try:
-                return pd.read_csv(file_path, usecols=columns, encoding=enc, header=header)
-            except Exception:
-                continue
-        raise RuntimeError(f"Unable to read: {file_path}")
+    def _to_float(self, series: pd.Series, default=0.0) -> pd.Series:
+        """Coerce a column to float, mapping empty strings and non-numeric values to default"""
+        return pd.to_numeric(series, errors="coerce").fillna(default).astype(float)
 
-    def _safe_float(self, value, default=0.0):
-        """Safely convert value to float, handling empty strings and non-numeric values"""
-        try:
-            if pd.isna(value) or value == '' or value is None:
-                return default
-            return float(value)
-        except (ValueError, TypeError):
-            return default
+    def _to_int(self, series: pd.Series, default=0) -> pd.Series:
+        """Coerce a column to int (truncating decimal strings), mapping invalid values to default"""
+        return pd.to_numeric(series, errors="coerce").fillna(default).astype(int)
 
-    def _safe_int(self, value, default=0):
-        """Safely convert value to int, handling empty strings and non-numeric values"""
-        try:
-            if pd.isna(value) or value == '' or value is None:
-                return default
-            return int(float(value))  # Convert to float first to handle decimal strings
-        except (ValueError, TypeError):
-            return default
+    async def _bulk_insert(self, session: AsyncSession, model, frame: pd.DataFrame) -> int:
+        """Insert all rows of frame into model's table with one executemany"""
+        records = frame.to_dict(orient="records")
+        if records:
+            await session.execute(insert(model), records)
+        return len(records)
 
     async def import_all(self, session: AsyncSession) -> dict[str, int]:
         stats = {"accounts": 0, "items": 0, "entries": 0, "index_entries": 0}
 
         # Read accounts CSV without headers, assuming first column is AccNo, fourth is AccName
-        accounts_file = os.path.join(ROOT_DATA_DIR, 'acctab.csv')
-        if os.path.exists(accounts_file):
+        if ACCOUNTS_CSV.exists():
             try:
-                accounts = self._read_csv(accounts_file, columns=[0, 3], header=None)  # type: ignore
+                accounts = read_csv(str(ACCOUNTS_CSV), columns=[0, 3], header=None)  # type: ignore
                 accounts.columns = ["AccNo", "AccName"]
-                for _, r in accounts.iterrows():
-                    session.add(DBIsamAccount(acc_no=str(r["AccNo"]), acc_name=str(r["AccName"])) )
-                    stats["accounts"] += 1
+                stats["accounts"] = await self._bulk_insert(session, DBIsamAccount, pd.DataFrame({
+                    "acc_no": accounts["AccNo"].astype(str),
+                    "acc_name": accounts["AccName"].astype(str),
+                }))
             except Exception as e:
                 print(f"Error importing accounts: {e}")
 
         # Read items CSV without headers
-        items_file = os.path.join(ROOT_DATA_DIR, 'itemstab.csv')
-        if os.path.exists(items_file):
+        if ITEMS_CSV.exists():
             try:
-                items = self._read_csv(items_file, header=None)  # type: ignore
+                items = read_csv(str(ITEMS_CSV), header=None)  # type: ignore
                 # Assume first two columns are ItemNo and ItemName
                 if len(items.columns) >= 2:
                     items.columns = ["ItemNo", "ItemName"] + [f"col_{i}" for i in range(2, len(items.columns))]
-                    for _, r in items.iterrows():
-                        session.add(DBIsamItem(item_no=str(r["ItemNo"]), item_name=str(r["ItemName"])) )
-                        stats["items"] += 1
+                    stats["items"] = await self._bulk_insert(session, DBIsamItem, pd.DataFrame({
+                        "item_no": items["ItemNo"].astype(str),
+                        "item_name": items["ItemName"].astype(str),
+                    }))
             except Exception as e:
                 print(f"Error importing items: {e}")
 
         # Read entries CSV without headers - based on actual structure from sample
-        entries_file = os.path.join(ROOT_DATA_DIR, 'entrytab.csv')
-        if os.path.exists(entries_file):
+        if ENTRIES_CSV.exists():
             try:
-                entries = self._read_csv(entries_file, header=None)  # type: ignore
+                entries = read_csv(str(ENTRIES_CSV), header=None)  # type: ignore
                 # Based on sample: RecId, ?, ?, AccNo, AmntDB, ItemAmnt, ?, ?, ?, ItemCont/Description
                 if len(entries.columns) >= 6:
-                    for _, r in entries.iterrows():
-                        session.add(DBIsamEntry(
-                            rec_id=self._safe_int(r.iloc[0]), 
-                            acc_no=str(r.iloc[3] if len(r) > 3 else ""), 
-                            amnt_db=self._safe_float(r.iloc[4] if len(r) > 4 else 0), 
-                            item_no=str(r.iloc[3] if len(r) > 3 else ""),  # Using AccNo as ItemNo for now
-                            item_amnt=self._safe_float(r.iloc[5] if len(r) > 5 else 0), 
-                            item_cont=self._safe_float(r.iloc[6] if len(r) > 6 else 0)
-                        ))
-                        stats["entries"] += 1
+                    acc_no = entries.iloc[:, 3].astype(str)
+                    stats["entries"] = await self._bulk_insert(session, DBIsamEntry, pd.DataFrame({
+                        "rec_id": self._to_int(entries.iloc[:, 0]),
+                        "acc_no": acc_no,
+                        "amnt_db": self._to_float(entries.iloc[:, 4]),
+                        "item_no": acc_no,  # Using AccNo as ItemNo for now
+                        "item_amnt": self._to_float(entries.iloc[:, 5]),
+                        "item_cont": self._to_float(entries.iloc[:, 6]) if len(entries.columns) > 6 else 0.0,
+                    }))
             except Exception as e:
                 print(f"Error importing entries: {e}")
 
         # Read index entries CSV without headers
-        index_file = os.path.join(ROOT_DATA_DIR, 'indexentrytab.csv')
-        if os.path.exists(index_file):
+        if INDEX_ENTRIES_CSV.exists():
             try:
-                index = self._read_csv(index_file, header=None)  # type: ignore
+                index = read_csv(str(INDEX_ENTRIES_CSV), header=None)  # type: ignore
                 # Map columns based on expected structure
                 if len(index.columns) >= 7:
-                    for _, r in index.iterrows():
-                        session.add(DBIsamIndexEntry(
-                            rec_no=self._safe_int(r.iloc[0]), 
-                            doc_no=self._safe_int(r.iloc[1] if len(r) > 1 else 0), 
-                            doc_knd=self._safe_int(r.iloc[2] if len(r) > 2 else 0), 
-                            acc_no=str(r.iloc[3] if len(r) > 3 else ""), 
-                            mdate=str(r.iloc[4] if len(r) > 4 else ""), 
-                            ratio=self._safe_float(r.iloc[5] if len(r) > 5 else 0), 
-                            username=str(r.iloc[6] if len(r) > 6 else "")
-                        ))
-                        stats["index_entries"] += 1
+                    stats["index_entries"] = await self._bulk_insert(session, DBIsamIndexEntry, pd.DataFrame({
+                        "rec_no": self._to_int(index.iloc[:, 0]),
+                        "doc_no": self._to_int(index.iloc[:, 1]),
+                        "doc_knd": self._to_int(index.iloc[:, 2]),
+                        "acc_no": index.iloc[:, 3].astype(str),
+                        "mdate": index.iloc[:, 4].astype(str),
+                        "ratio": self._to_float(index.iloc[:, 5]),
+                        "username": index.iloc[:, 6].astype(str),
+                    }))
             except Exception as e:
                 print(f"Error importing index entries: {e}")
 
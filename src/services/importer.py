@@ -1,93 +1,129 @@
-import os
 import pandas as pd
 from datetime import datetime
 from decimal import Decimal
+from pathlib import Path
+from uuid import uuid4
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, select
 from src.db.models.invoices import Invoice, InvoiceItem, InvoiceStatus
 from src.core.config import Config
+from src.services.csv_reader import read_csv
 
-DATA_DIR = os.path.join(os.getcwd(), 'src/scripts/data')
+DATA_DIR = Path.cwd() / "src" / "scripts" / "data"
+ITEMS_CSV = str(DATA_DIR / "Items.csv")
+ENTRIES_CSV = str(DATA_DIR / "EntryTab.csv")
+INDEX_ENTRIES_CSV = str(DATA_DIR / "IndexEntry.csv")
 
-TRY_ENCODINGS = ("utf-8-sig", "cp1256", "latin-1")
+TWOPLACES = Decimal("0.01")
+IN_CHUNK_SIZE = 10_000
+
+
+def _money(value) -> Decimal:
+    """Round a CSV amount to cents; a blank (NaN) or missing cell counts as 0.00"""
+    if value is None or pd.isna(value):
+        return Decimal("0.00")
+    return Decimal(value).quantize(TWOPLACES)
+
+
+def _account_entries(entries_df: pd.DataFrame) -> tuple[dict, dict]:
+    """Per-account AmntDB total and first entry, with the same values a per-account scan gives.
+
+    Each account is summed with Series.sum (groupby's own sum rounds differently in the last
+    bit), and the first entry is upcast to the frame's common dtype like a row Series would be,
+    so e.g. ItemNo 35 still renders as "35.0".
+    """
+    acc_sum = entries_df.groupby("AccNo", sort=False)["AmntDB"].agg(lambda amounts: amounts.sum()).to_dict()
+    first_rows = entries_df.drop_duplicates("AccNo")
+    acc_first = first_rows.astype(first_rows.to_numpy().dtype).set_index(first_rows["AccNo"]).to_dict("index")
+    return acc_sum, acc_first
 
-class ImportService:
-    def _read_csv(self, file_path: str, columns=None) -> pd.DataFrame:
-        for enc in TRY_ENCODINGS:
-            try:
-                return pd.read_csv(file_path, usecols=columns, encoding=enc)
-            except Exception:
-                continue
-        raise RuntimeError(f"Unable to read: {file_path}")
 
+class ImportService:
     async def import_from_scripts(self, session: AsyncSession) -> int:
-        items_df = self._read_csv(os.path.join(DATA_DIR, 'Items.csv'), columns=["ItemNo", "ItemName"])  # noqa: F841
-        entries_df = self._read_csv(os.path.join(DATA_DIR, 'EntryTab.csv'), columns=["AccNo", "AmntDB", "ItemNo", "ItemAmnt", "ItemCont"])  # noqa: E501
-        index_df = self._read_csv(os.path.join(DATA_DIR, 'IndexEntry.csv'), columns=["RecNo", "DocKnd", "AccNo", "MDate", "Ratio", "UserName"])  # noqa: E501
+        items_df = read_csv(ITEMS_CSV, columns=["ItemNo", "ItemName"])  # noqa: F841
+        entries_df = read_csv(ENTRIES_CSV, columns=["AccNo", "AmntDB", "ItemNo", "ItemAmnt", "ItemCont"])  # noqa: E501
+        index_df = read_csv(INDEX_ENTRIES_CSV, columns=["RecNo", "DocKnd", "AccNo", "MDate", "Ratio", "UserName"])  # noqa: E501
+
+        # Parse every MDate in one vectorized pass; missing/unparseable dates fall back to today (UTC, midnight)
+        today = pd.Timestamp(datetime.utcnow().date())
+        index_df["mdate_parsed"] = pd.to_datetime(index_df["MDate"], format="%Y/%m/%d", errors="coerce").fillna(today)
+
+        # Per-account totals and first entry, computed once instead of scanning entries_df per invoice
+        acc_sum, acc_first = _account_entries(entries_df)
 
-        # We'll group by RecNo (document number) and create one invoice per RecNo that is not present in DB
-        inserted = 0
+        # Look up every candidate invoice number in one query instead of one SELECT per row
+        # (chunked so the IN list stays under the driver's bind-parameter limit)
+        candidates = index_df["RecNo"].dropna().astype(int).astype(str).unique().tolist()
+        existing: set[str] = set()
+        for start in range(0, len(candidates), IN_CHUNK_SIZE):
+            chunk = candidates[start:start + IN_CHUNK_SIZE]
+            res = await session.execute(select(Invoice.invoice_number).where(Invoice.invoice_number.in_(chunk)))
+            existing.update(res.scalars().all())
+
+        # We'll group by RecNo (document number) and create one invoice per RecNo that is not present in DB.
+        # Rows are collected and inserted in two executemany batches after the loop.
+        invoice_rows: list[dict] = []
+        item_rows: list[dict] = []
         for _, idx in index_df.iterrows():
             rec_no = int(idx["RecNo"]) if pd.notna(idx["RecNo"]) else None
             if rec_no is None:
                 continue
 
-            # check if invoice with invoice_number == rec_no exists
-            exists_stmt = select(Invoice).where(Invoice.invoice_number == str(rec_no))
-            res = await session.execute(exists_stmt)
-            if res.scalars().first():
+            # skip invoices already in the DB or already queued in this batch
+            if str(rec_no) in existing:
                 continue
+            existing.add(str(rec_no))
 
             # filter entries for this rec_no in entries_df: RecId is not provided linking; simple approach uses AccNo match
             # In provided sample, totals per invoice exist in index_df["Total"], but columns selected don't include Total.
             # We'll compute a simplistic total sum of AmntDB for matching AccNo and DocKnd context; fallback to 0.
             account_num = int(idx["AccNo"]) if pd.notna(idx["AccNo"]) else None
-            mdate = str(idx["MDate"]) if pd.notna(idx["MDate"]) else datetime.utcnow().strftime('%Y/%m/%d')
             ratio = float(idx["Ratio"]) if pd.notna(idx["Ratio"]) else 0.0
             user_name = str(idx["UserName"]) if pd.notna(idx["UserName"]) else "system"
 
             # Aggregate entries
-            if account_num is not None:
-                related = entries_df[entries_df["AccNo"] == account_num]
-            else:
-                related = entries_df.iloc[0:0]
-
-            subtotal = float(related["AmntDB"].sum()) if not related.empty else 0.0
+            first = acc_first.get(account_num) if account_num is not None else None
+            subtotal = float(acc_sum[account_num]) if first is not None else 0.0
             # Simple calc like script: tax = subtotal * (ratio/100); seller_tax = tax * 0.15; net_total = subtotal - seller_tax - tax
             tax = subtotal * (ratio/100.0)
             seller_tax = tax * 0.15
             net_total = subtotal - seller_tax - tax
 
-            inv = Invoice(
+            # Decimal(float) is exact, so quantizing gives the same cents as round(x, 2) without a str round-trip
+            tax_amount = Decimal(tax).quantize(TWOPLACES)
+
+            # Primary keys are generated client-side so items can reference them without a flush
+            invoice_id = uuid4()
+            invoice_rows.append(dict(
+                id=invoice_id,
                 invoice_number=str(rec_no),
                 store_name=Config.STORE_NAME or "",
                 store_address=Config.STORE_ADDRESS or "",
                 vat_number=Config.STORE_VAT_NUMBER or "",
-                date=datetime.strptime(mdate, "%Y/%m/%d"),
-                total=Decimal(str(round(subtotal, 2))),
-                taxes=Decimal(str(round(tax, 2))),
-                seller_taxes=Decimal(str(round(seller_tax, 2))),
-                net_total=Decimal(str(round(net_total, 2))),
+                date=idx["mdate_parsed"].to_pydatetime(),
+                total=Decimal(subtotal).quantize(TWOPLACES),
+                taxes=tax_amount,
+                seller_taxes=Decimal(seller_tax).quantize(TWOPLACES),
+                net_total=Decimal(net_total).quantize(TWOPLACES),
                 user_name=user_name,
                 account_id=str(account_num) if account_num is not None else "",
                 status=InvoiceStatus.PENDING,
-            )
-            session.add(inv)
-            await session.flush()
+            ))
 
             # Add first line item from related if exists
-            if not related.empty:
-                first = related.iloc[0]
-                item = InvoiceItem(
-                    invoice_id=inv.id,
+            if first is not None:
+                item_rows.append(dict(
+                    invoice_id=invoice_id,
                     item_name=str(first.get("ItemNo", "")),
                     quantity=int(first.get("ItemCont", 1) or 1),
-                    price=Decimal(str(first.get("ItemAmnt", 0.0) or 0.0)),
-                    tax=Decimal(str(round(tax, 2))),
-                )
-                session.add(item)
+                    price=_money(first.get("ItemAmnt")),
+                    tax=tax_amount,
+                ))
 
-            inserted += 1
+        if invoice_rows:
+            await session.execute(insert(Invoice), invoice_rows)
+        if item_rows:
+            await session.execute(insert(InvoiceItem), item_rows)
 
         await session.commit()
-        return inserted
+        return len(invoice_rows)
@@ -1,5 +1,7 @@
 # src/services/invoice.py
-from sqlalchemy import select, func
+from datetime import datetime
+from uuid import UUID
+from sqlalchemy import select, func, tuple_
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List
 from src.db.models.invoices import Invoice, InvoiceStatus
@@ -12,15 +14,34 @@ class InvoicesServices:
         return int(count)
 
     async def get_all_status_counts(self, session: AsyncSession) -> dict[str, int]:
-        counts: dict[str, int] = {}
-        for st in InvoiceStatus:
-            counts[st.value] = await self.get_invoice_count_by_status(session, st)
+        # One grouped query instead of a COUNT round-trip per status
+        stmt = select(Invoice.status, func.count()).group_by(Invoice.status)
+        result = await session.execute(stmt)
+        counts: dict[str, int] = {st.value: 0 for st in InvoiceStatus}
+        for status, count in result.all():
+            counts[InvoiceStatus(status).value] = int(count)
         return counts
 
-    async def get_invoices(self, session: AsyncSession, limit: int = 10, offset: int = 0, status: InvoiceStatus | None = None) -> List[Invoice]:
+    async def get_invoices(
+        self,
+        session: AsyncSession,
+        limit: int = 10,
+        offset: int = 0,
+        status: InvoiceStatus | None = None,
+        cursor: tuple[datetime, UUID] | None = None,
+    ) -> List[Invoice]:
+        """List invoices newest first.
+
+        Pass the (created_at, id) of the last row of the previous page as `cursor` for keyset
+        pagination; `offset` is only applied when no cursor is given.
+        """
         stmt = select(Invoice)
         if status:
             stmt = stmt.where(Invoice.status == status)
-        stmt = stmt.offset(offset).limit(limit).order_by(Invoice.created_at.desc())
+        if cursor is not None:
+            stmt = stmt.where(tuple_(Invoice.created_at, Invoice.id) < cursor)
+        elif offset:
+            stmt = stmt.offset(offset)
+        stmt = stmt.order_by(Invoice.created_at.desc(), Invoice.id.desc()).limit(limit)
         result = await session.execute(stmt)
         return list(result.scalars().all())
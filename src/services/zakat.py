@@ -1,115 +1,210 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import hashlib
+from collections import defaultdict
 from datetime import datetime
-from typing import Tuple
-from uuid import uuid4
+from typing import Iterable, List, Tuple
+from uuid import UUID, uuid4
+from xml.sax.saxutils import escape
 
 import httpx
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import Row, select, update
 
 from src.core.config import Config
-from src.db.models.invoices import Invoice, InvoiceStatus
+from src.db.models.invoices import Invoice, InvoiceItem, InvoiceStatus
 
+# Invariant XML bodies as str.format templates (placeholders are filled in C, no per-call regex scan);
+# free-text fields are XML-escaped before substitution. The body is split around the line items
+# so they can be joined straight into the output.
+# Line fields (UUID, int quantity, Decimal price) never contain markup, and no value lands in an
+# attribute, so element-text escaping is all that is needed; an element-tree builder would only
+# add a node per field plus a serialization pass on top of the same string work.
+_INVOICE_XML_HEAD = """<?xml version="1.0" encoding="UTF-8"?>
+<Invoice xmlns:cac="urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2"
+         xmlns:cbc="urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2">
+  <cbc:ID>{invoice_number}</cbc:ID>
+  <cbc:UUID>{uuid}</cbc:UUID>
+  <cbc:IssueDate>{date}</cbc:IssueDate>
+  <cbc:TaxTotal>{taxes}</cbc:TaxTotal>
+  <cbc:LegalMonetaryTotal>{net_total}</cbc:LegalMonetaryTotal>
+  <cac:AccountingSupplierParty>
+    <cbc:Name>{store_name}</cbc:Name>
+    <cbc:CompanyID>{vat_number}</cbc:CompanyID>
+  </cac:AccountingSupplierParty>
+  <cac:AccountingCustomerParty>
+    <cbc:Name>{account_id}</cbc:Name>
+  </cac:AccountingCustomerParty>
+  """
+
+_INVOICE_XML_TAIL = """
+</Invoice>"""
+
+_INVOICE_LINE_TEMPLATE = (
+    "<cac:InvoiceLine><cbc:ID>{id}</cbc:ID><cbc:InvoicedQuantity>{quantity}</cbc:InvoicedQuantity>"
+    "<cbc:LineExtensionAmount>{price}</cbc:LineExtensionAmount></cac:InvoiceLine>"
+)
 
 class ZakatService:
-    async def process_pending(self, session: AsyncSession, limit: int = 50, simulate: bool = True) -> dict[str, int]:
+    async def process_pending(
+        self,
+        session: AsyncSession,
+        limit: int = 50,
+        simulate: bool = True,
+        concurrency: int = 16,
+    ) -> dict[str, int]:
+        # Only the columns build_xml needs, as plain rows instead of hydrated ORM objects
         stmt = (
-            select(Invoice)
-            .options(selectinload(Invoice.items))
+            select(
+                Invoice.id,
+                Invoice.invoice_number,
+                Invoice.date,
+                Invoice.taxes,
+                Invoice.net_total,
+                Invoice.store_name,
+                Invoice.vat_number,
+                Invoice.account_id,
+            )
             .where(Invoice.status == InvoiceStatus.PENDING)
             .limit(limit)
         )
-        res = await session.execute(stmt)
-        invoices = list(res.scalars().all())
+        invoices = list((await session.execute(stmt)).all())
+
+        items_by_invoice: dict[UUID, list[Row]] = defaultdict(list)
+        if invoices:
+            items_stmt = select(
+                InvoiceItem.invoice_id, InvoiceItem.id, InvoiceItem.quantity, InvoiceItem.price
+            ).where(InvoiceItem.invoice_id.in_([inv.id for inv in invoices]))
+            for item in (await session.execute(items_stmt)).all():
+                items_by_invoice[item.invoice_id].append(item)
 
         processed = 0
         success = 0
         failed = 0
+        to_upload: List[Tuple[Row, str, str]] = []
+        # Per-invoice column changes, written with bulk UPDATEs by primary key at the end
+        updates: List[dict] = []
+
+        # XML build + hashing is CPU work with no DB access; run it off the event loop for all
+        # invoices at once
+        payloads = await asyncio.gather(
+            *(asyncio.to_thread(self._build_and_hash, inv, items_by_invoice[inv.id]) for inv in invoices),
+            return_exceptions=True,
+        )
 
-        for inv in invoices:
+        for inv, payload in zip(invoices, payloads):
             processed += 1
-            try:
-                xml = self.build_xml(inv)
-                enc_xml, xml_hash = self.encrypt_xml(xml)
-
-                inv.zatca_xml = enc_xml
-                inv.zatca_xml_hash = xml_hash
-                inv.status = InvoiceStatus.IN_PROGRESS
-                await session.flush()
-
-                if simulate or not Config.ZATCA_ENDPOINT:
-                    inv.zatca_uuid = str(uuid4())
-                    inv.status = InvoiceStatus.DONE
-                    inv.submitted_at = datetime.utcnow()
-                    await session.flush()
+            if isinstance(payload, BaseException):
+                updates.append({"id": inv.id, "status": InvoiceStatus.FAILED, "last_error": str(payload)[:1000]})
+                failed += 1
+                continue
+            enc_xml, xml_hash = payload
+
+            if simulate or not Config.ZATCA_ENDPOINT:
+                updates.append({
+                    "id": inv.id,
+                    "zatca_xml": enc_xml,
+                    "zatca_xml_hash": xml_hash,
+                    "zatca_uuid": str(uuid4()),
+                    "status": InvoiceStatus.DONE,
+                    "submitted_at": datetime.utcnow(),
+                })
+                success += 1
+            else:
+                to_upload.append((inv, enc_xml, xml_hash))
+
+        # Uploads only touch the network, so they run concurrently; results are applied serially.
+        # upload_batch returns results in submission order (one single-invoice request each),
+        # so zip pairs every result with its invoice in O(1) without a hash index.
+        if to_upload:
+            results = await self.upload_batch(to_upload, concurrency=concurrency)
+            for (inv, enc_xml, xml_hash), (ok, msg, remote_id) in zip(to_upload, results):
+                if ok:
+                    updates.append({
+                        "id": inv.id,
+                        "zatca_xml": enc_xml,
+                        "zatca_xml_hash": xml_hash,
+                        "zatca_uuid": remote_id or str(uuid4()),
+                        "status": InvoiceStatus.DONE,
+                        "submitted_at": datetime.utcnow(),
+                    })
                     success += 1
                 else:
-                    ok, msg, remote_id = await self.upload_xml(enc_xml, xml_hash, str(inv.id))
-                    if ok:
-                        inv.zatca_uuid = remote_id or str(uuid4())
-                        inv.status = InvoiceStatus.DONE
-                        inv.submitted_at = datetime.utcnow()
-                        success += 1
-                    else:
-                        inv.status = InvoiceStatus.FAILED
-                        inv.last_error = msg[:1000]
-                        failed += 1
-            except Exception as e:
-                inv.status = InvoiceStatus.FAILED
-                inv.last_error = str(e)[:1000]
-                failed += 1
+                    updates.append({
+                        "id": inv.id,
+                        "zatca_xml": enc_xml,
+                        "zatca_xml_hash": xml_hash,
+                        "status": InvoiceStatus.FAILED,
+                        "last_error": msg[:1000],
+                    })
+                    failed += 1
 
+        if updates:
+            await session.execute(update(Invoice), updates)
         await session.commit()
         return {"processed": processed, "success": success, "failed": failed}
 
-    def build_xml(self, inv: Invoice) -> str:
-        items_xml = "".join(
-            [
-                f"<cac:InvoiceLine><cbc:ID>{i.id}</cbc:ID><cbc:InvoicedQuantity>{i.quantity}</cbc:InvoicedQuantity><cbc:LineExtensionAmount>{i.price}</cbc:LineExtensionAmount></cac:InvoiceLine>"
-                for i in (inv.items or [])
-            ]
-        )
-        return (
-            """<?xml version="1.0" encoding="UTF-8"?>
-<Invoice xmlns:cac="urn:oasis:names:specification:ubl:schema:xsd:CommonAggregateComponents-2"
-         xmlns:cbc="urn:oasis:names:specification:ubl:schema:xsd:CommonBasicComponents-2">
-  <cbc:ID>{invoice_number}</cbc:ID>
-  <cbc:UUID>{uuid}</cbc:UUID>
-  <cbc:IssueDate>{date}</cbc:IssueDate>
-  <cbc:TaxTotal>{taxes}</cbc:TaxTotal>
-  <cbc:LegalMonetaryTotal>{net_total}</cbc:LegalMonetaryTotal>
-  <cac:AccountingSupplierParty>
-    <cbc:Name>{store_name}</cbc:Name>
-    <cbc:CompanyID>{vat_number}</cbc:CompanyID>
-  </cac:AccountingSupplierParty>
-  <cac:AccountingCustomerParty>
-    <cbc:Name>{account_id}</cbc:Name>
-  </cac:AccountingCustomerParty>
-  {items}
-</Invoice>"""
-        ).format(
-            invoice_number=inv.invoice_number,
+    def build_xml(self, inv: Invoice | Row, items: Iterable | None = None) -> str:
+        """Render UBL XML for an invoice (ORM object or column row); items default to inv.items"""
+        if items is None:
+            items = inv.items or ()
+
+        head = _INVOICE_XML_HEAD.format(
+            invoice_number=escape(str(inv.invoice_number)),
             uuid=str(inv.id),
-            date=inv.date.date().isoformat() if isinstance(inv.date, datetime) else str(inv.date),
+            date=inv.date.date().isoformat() if isinstance(inv.date, datetime) else escape(str(inv.date)),
             taxes=inv.taxes,
             net_total=inv.net_total,
-            store_name=inv.store_name,
-            vat_number=inv.vat_number,
-            account_id=inv.account_id,
-            items=items_xml,
+            store_name=escape(str(inv.store_name)),
+            vat_number=escape(str(inv.vat_number)),
+            account_id=escape(str(inv.account_id)),
+        )
+        lines = (
+            _INVOICE_LINE_TEMPLATE.format(id=i.id, quantity=i.quantity, price=i.price)
+            for i in items
         )
+        # One join for the whole document: no separate items string copied into the body
+        return "".join((head, *lines, _INVOICE_XML_TAIL))
 
-    def encrypt_xml(self, xml: str) -> Tuple[str, str]:
-        xml_bytes = xml.encode("utf-8")
+    def _build_and_hash(self, inv: Invoice | Row, items: Iterable | None = None) -> Tuple[str, str]:
+        return self.encrypt_xml(self.build_xml(inv, items))
+
+    def encrypt_xml(self, xml: str | bytes) -> Tuple[str, str]:
+        # Already-encoded XML is hashed and base64-encoded as-is, without another UTF-8 pass
+        xml_bytes = xml if isinstance(xml, bytes) else xml.encode("utf-8")
         xml_hash = hashlib.sha256(xml_bytes).hexdigest()
         enc_xml = base64.b64encode(xml_bytes).decode("ascii")
         return enc_xml, xml_hash
 
-    async def upload_xml(self, enc_xml: str, xml_hash: str, invoice_uuid: str) -> Tuple[bool, str, str | None]:
+    async def upload_batch(
+        self,
+        batch: List[Tuple[Invoice | Row, str, str]],
+        concurrency: int = 16,
+    ) -> List[Tuple[bool, str, str | None]]:
+        """Upload (invoice, enc_xml, xml_hash) entries over the service's pooled HTTP client, at most `concurrency` at a time.
+
+        Results line up with `batch` entry for entry.
+        """
+        from src.services.zatca_production import get_zatca_service
+
+        try:
+            # enc_xml is already the base64 payload ZATCA expects; pass it through untouched
+            results = await get_zatca_service().submit_invoices_batch(
+                [(None, xml_hash, str(inv.id), enc_xml) for inv, enc_xml, xml_hash in batch],
+                max_concurrency=concurrency,
+            )
+        except Exception as e:
+            return [(False, str(e), None)] * len(batch)
+        return [self._upload_outcome(result) for result in results]
+
+    async def upload_xml(
+        self,
+        enc_xml: str,
+        xml_hash: str,
+        invoice_uuid: str,
+    ) -> Tuple[bool, str, str | None]:
         """Upload XML to ZATCA using production service"""
         try:
             # Import here to avoid circular imports
@@ -117,20 +212,23 @@ class ZakatService:
             
             zatca_service = get_zatca_service()
             
-            # Decode the base64 XML
-            xml_bytes = base64.b64decode(enc_xml)
-            xml_str = xml_bytes.decode('utf-8')
+            # enc_xml is already the base64 payload ZATCA expects; pass it through untouched
+            result = await zatca_service.submit_invoice(
+                None, xml_hash, invoice_uuid, invoice_b64=enc_xml
+            )
             
-            # Submit to ZATCA
-            result = await zatca_service.submit_invoice(xml_str, xml_hash, invoice_uuid)
-            
-            if result["success"]:
-                return True, result["message"], result["zatca_uuid"]
-            else:
-                error_msg = result.get("error", "Unknown error")
-                if "zatca_errors" in result and result["zatca_errors"]:
-                    error_msg += f" - ZATCA Errors: {result['zatca_errors']}"
-                return False, error_msg, None
+            return self._upload_outcome(result)
                 
         except Exception as e:
             return False, str(e), None
+
+    @staticmethod
+    def _upload_outcome(result: dict) -> Tuple[bool, str, str | None]:
+        """Reduce a submit_invoice result to (ok, message, remote_id)"""
+        if result["success"]:
+            return True, result["message"], result["zatca_uuid"]
+        else:
+            error_msg = result.get("error", "Unknown error")
+            if "zatca_errors" in result and result["zatca_errors"]:
+                error_msg += f" - ZATCA Errors: {result['zatca_errors']}"
+            return False, error_msg, None
@@ -6,17 +6,22 @@ This module implements the complete ZATCA API integration following
 the official specifications for onboarding, reporting, and clearance.
 """
 
+import asyncio
 import base64
 import hashlib
-import json
+import logging
+import re
 import ssl
-import tempfile
 import os
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple, Union
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple, Union
 from pathlib import Path
 
 import httpx
+import orjson
 import structlog
 from cryptography import x509
 from cryptography.hazmat.primitives import serialization, hashes
@@ -24,6 +29,34 @@ from cryptography.hazmat.primitives.asymmetric import ec
 
 logger = structlog.get_logger(__name__)
 
+# Substring checks run by validate_invoice, matched together in a single regex pass
+_VALIDATION_CHECKS = {
+    "has_invoice_root": '<Invoice',
+    "has_customization_id": 'BR-KSA-CB',
+    "has_profile_id": 'reporting:1.0',
+    "has_ubl_namespace": 'urn:oasis:names:specification:ubl:schema:xsd:Invoice-2',
+    "has_vat_calculation": '<cbc:Percent>',
+    "has_currency_sar": 'currencyID="SAR"',
+    "has_supplier_info": '<cac:AccountingSupplierParty>',
+    "has_customer_info": '<cac:AccountingCustomerParty>',
+    "has_tax_total": '<cac:TaxTotal>',
+    "has_monetary_total": '<cac:LegalMonetaryTotal>',
+    "has_invoice_lines": '<cac:InvoiceLine>'
+}
+
+_VALIDATION_RE = re.compile("|".join(map(re.escape, _VALIDATION_CHECKS.values())))
+_XML_DECLARATION_RE = re.compile(r'\s*<\?xml')
+
+# Seconds a get_api_status snapshot is reused before it is rebuilt
+STATUS_CACHE_TTL = 1.0
+
+# Headers sent with every API request; _make_request copies them into a per-call dict
+_DEFAULT_HEADERS = MappingProxyType({
+    "Content-Type": "application/json",
+    "Accept": "application/json",
+    "Accept-Language": "en"
+})
+
 
 class ZATCAAPIClient:
     """
@@ -61,11 +94,63 @@ class ZATCAAPIClient:
         self.compliance_csid = None
         self.production_csid = None
         self.request_id = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self._status_cache: Optional[Tuple[float, Dict]] = None
         
         # Load certificates if provided
         if private_key_path and certificate_path:
             self._load_certificates()
     
+    async def __aenter__(self) -> "ZATCAAPIClient":
+        self._get_client()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+    
+    async def aclose(self) -> None:
+        """Close the pooled HTTP client (a new one is opened on the next request)"""
+        
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the instance's pooled HTTP/2 client, creating it on first use"""
+        
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                verify=self._ssl_context if self._ssl_context else True,
+                http2=True,
+                limits=httpx.Limits(max_connections=50, max_keepalive_connections=20)
+            )
+        return self._client
+    
+    def _fork(self) -> "ZATCAAPIClient":
+        """
+        Return a client with fresh onboarding state (CSIDs, request ID) that shares this
+        client's certificates, SSL context and connection pool
+        """
+        
+        # No key/cert paths here: the fork reuses the loaded material instead of re-reading it
+        forked = ZATCAAPIClient(sandbox_mode=self.sandbox_mode)
+        
+        # Shared with this client: certificate files, loaded key material, SSL context and pool
+        forked.base_url = self.base_url
+        forked.private_key_path = self.private_key_path
+        forked.certificate_path = self.certificate_path
+        if hasattr(self, 'private_key'):
+            forked.private_key = self.private_key
+        if hasattr(self, 'certificate'):
+            forked.certificate = self.certificate
+        forked._ssl_context = self._ssl_context
+        forked._client = self._get_client()
+        
+        # Per fork: CSIDs, request ID and the status snapshot keep the constructor's fresh values
+        return forked
+    
     def _load_certificates(self):
         """Load private key and certificate from files"""
         try:
@@ -78,6 +163,10 @@ class ZATCAAPIClient:
             if self.certificate_path and os.path.exists(self.certificate_path):
                 with open(self.certificate_path, 'rb') as f:
                     self.certificate = x509.load_pem_x509_certificate(f.read())
+            
+            # Built once and shared by every HTTP client this instance creates
+            if hasattr(self, 'private_key') and hasattr(self, 'certificate'):
+                self._ssl_context = self._create_ssl_context()
                     
             logger.info("Certificates loaded successfully")
             
@@ -90,7 +179,8 @@ class ZATCAAPIClient:
                            endpoint: str, 
                            data: Optional[Dict] = None,
                            headers: Optional[Dict] = None,
-                           auth_cert: Optional[str] = None) -> httpx.Response:
+                           auth_cert: Optional[str] = None,
+                           content: Optional[bytes] = None) -> httpx.Response:
         """
         Make HTTP request to ZATCA API
         
@@ -100,6 +190,7 @@ class ZATCAAPIClient:
             data: Request payload
             headers: Additional headers
             auth_cert: Authentication certificate
+            content: Already serialized JSON body, sent instead of data
             
         Returns:
             HTTP response
@@ -107,72 +198,44 @@ class ZATCAAPIClient:
         
         url = f"{self.base_url}{endpoint}"
         
-        # Default headers
-        request_headers = {
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-            "Accept-Language": "en"
-        }
+        request_headers = {**_DEFAULT_HEADERS, **(headers or {})}
         
-        if headers:
-            request_headers.update(headers)
-            
         if auth_cert:
             request_headers["authentication-certificate"] = auth_cert
         
-        # Create SSL context if certificates are available
-        ssl_context = None
-        if hasattr(self, 'private_key') and hasattr(self, 'certificate'):
-            ssl_context = self._create_ssl_context()
+        if method.upper() not in ("GET", "POST"):
+            raise ValueError(f"Unsupported HTTP method: {method}")
         
-        async with httpx.AsyncClient(
-            timeout=30.0,
-            verify=ssl_context if ssl_context else True
-        ) as client:
-            
-            if method.upper() == "GET":
-                response = await client.get(url, headers=request_headers)
-            elif method.upper() == "POST":
-                response = await client.post(url, json=data, headers=request_headers)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
-            
-            logger.info(
+        if content is None and method.upper() == "POST" and data is not None:
+            content = orjson.dumps(data)
+        
+        # Every request goes through the same keep-alive connection pool; POST bodies are
+        # JSON (request_headers already carries the JSON Content-Type)
+        response = await self._get_client().request(
+            method.upper(),
+            url,
+            content=content,
+            headers=request_headers
+        )
+        
+        if logger.is_enabled_for(logging.DEBUG):
+            logger.debug(
                 "ZATCA API request",
                 method=method,
                 endpoint=endpoint,
                 status_code=response.status_code
             )
-            
-            return response
+        
+        return response
     
     def _create_ssl_context(self) -> ssl.SSLContext:
         """Create SSL context with client certificate"""
         
         context = ssl.create_default_context()
         
-        # Create temporary files for certificate and key
-        cert_pem = self.certificate.public_bytes(serialization.Encoding.PEM)
-        key_pem = self.private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption()
-        )
-        
-        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.pem') as cert_file:
-            cert_file.write(cert_pem)
-            cert_file_path = cert_file.name
-            
-        with tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.pem') as key_file:
-            key_file.write(key_pem)
-            key_file_path = key_file.name
-        
-        try:
-            context.load_cert_chain(cert_file_path, key_file_path)
-        finally:
-            # Clean up temporary files
-            os.unlink(cert_file_path)
-            os.unlink(key_file_path)
+        # The PEM files were just parsed successfully, so load them in place
+        # instead of re-serializing the key through temporary files
+        context.load_cert_chain(self.certificate_path, self.private_key_path)
         
         return context
     
@@ -201,10 +264,11 @@ class ZATCAAPIClient:
             response = await self._make_request("POST", "/compliance", data=payload)
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 
                 self.compliance_csid = result.get("binarySecurityToken")
                 self.request_id = result.get("requestID")
+                self._status_cache = None
                 
                 logger.info(
                     "Compliance CSID generated successfully",
@@ -267,9 +331,10 @@ class ZATCAAPIClient:
             )
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 
                 self.production_csid = result.get("binarySecurityToken")
+                self._status_cache = None
                 
                 logger.info("Production CSID generated successfully")
                 
@@ -295,71 +360,73 @@ class ZATCAAPIClient:
                 "error": str(e)
             }
     
-    async def report_invoice(self, 
-                           invoice_xml: str, 
-                           invoice_hash: Optional[str] = None) -> Dict:
+    async def _submit_xml(self,
+                          endpoint: str,
+                          action: str,
+                          past_tense: str,
+                          auth_cert: str,
+                          invoice_xml: Optional[str],
+                          invoice_hash: Optional[str],
+                          invoice_b64: Optional[str],
+                          extra_fields: Optional[Dict[str, str]] = None) -> Dict:
         """
-        Report simplified invoice to ZATCA
+        Submit one invoice to a reporting/clearance endpoint
         
-        Args:
-            invoice_xml: UBL 2.1 XML invoice content
-            invoice_hash: SHA256 hash of the invoice (calculated if not provided)
-            
-        Returns:
-            Response from reporting API
+        The XML is UTF-8 encoded at most once and that buffer feeds both the hash and base64.
+        extra_fields maps result keys to response keys copied into the success result.
         """
         
-        logger.info("Reporting simplified invoice")
-        
-        # Calculate hash if not provided
-        if not invoice_hash:
-            invoice_hash = hashlib.sha256(invoice_xml.encode('utf-8')).hexdigest()
-        
-        # Encode invoice in base64
-        invoice_b64 = base64.b64encode(invoice_xml.encode('utf-8')).decode('utf-8')
+        if invoice_b64 is not None:
+            invoice_field = orjson.dumps(invoice_b64)
         
-        payload = {
-            "invoiceHash": invoice_hash,
-            "invoice": invoice_b64
-        }
-        
-        # Use production CSID if available, otherwise compliance CSID
-        auth_cert = self.production_csid or self.compliance_csid
+        if not invoice_hash or invoice_b64 is None:
+            xml_bytes = invoice_xml.encode('utf-8') if invoice_xml is not None else base64.b64decode(invoice_b64)
+            
+            # Calculate hash if not provided
+            if not invoice_hash:
+                invoice_hash = hashlib.sha256(xml_bytes).hexdigest()
+            
+            # Encode invoice in base64 unless the caller already has it; the base64 alphabet
+            # needs no JSON escaping, so the bytes are spliced into the body without a str round-trip
+            if invoice_b64 is None:
+                invoice_field = b'"' + base64.b64encode(xml_bytes) + b'"'
         
-        if not auth_cert:
-            return {
-                "success": False,
-                "error": "Authentication certificate required. Complete onboarding first."
-            }
+        body = b''.join((b'{"invoiceHash":', orjson.dumps(invoice_hash), b',"invoice":', invoice_field, b'}'))
         
         try:
             response = await self._make_request(
                 "POST", 
-                "/invoices/reporting/single", 
-                data=payload,
+                endpoint, 
+                content=body,
                 auth_cert=auth_cert
             )
             
             if response.status_code in [200, 202]:
-                result = response.json()
+                result = orjson.loads(response.content)
                 
-                logger.info(
-                    "Invoice reported successfully",
-                    status=result.get("status"),
-                    invoice_hash=result.get("invoiceHash")
-                )
+                if logger.is_enabled_for(logging.INFO):
+                    logger.info(
+                        f"Invoice {past_tense} successfully",
+                        status=result.get("status"),
+                        invoice_hash=result.get("invoiceHash")
+                    )
                 
-                return {
+                submission = {
                     "success": True,
                     "status": result.get("status"),
-                    "invoice_hash": result.get("invoiceHash"),
-                    "warnings": result.get("warnings"),
-                    "errors": result.get("errors"),
-                    "response": result
+                    "invoice_hash": result.get("invoiceHash")
                 }
+                for key, response_key in (extra_fields or {}).items():
+                    submission[key] = result.get(response_key)
+                submission.update(
+                    warnings=result.get("warnings"),
+                    errors=result.get("errors"),
+                    response=result
+                )
+                return submission
             else:
                 error_msg = f"HTTP {response.status_code}: {response.text}"
-                logger.error("Invoice reporting failed", error=error_msg)
+                logger.error(f"Invoice {action} failed", error=error_msg)
                 
                 return {
                     "success": False,
@@ -368,39 +435,91 @@ class ZATCAAPIClient:
                 }
                 
         except Exception as e:
-            logger.error("Invoice reporting exception", error=str(e))
+            logger.error(f"Invoice {action} exception", error=str(e))
             return {
                 "success": False,
                 "error": str(e)
             }
     
-    async def clear_invoice(self, 
-                          invoice_xml: str, 
-                          invoice_hash: Optional[str] = None) -> Dict:
+    async def report_invoice(self, 
+                           invoice_xml: Optional[str], 
+                           invoice_hash: Optional[str] = None,
+                           invoice_b64: Optional[str] = None) -> Dict:
         """
-        Clear standard invoice with ZATCA
+        Report simplified invoice to ZATCA
         
         Args:
-            invoice_xml: UBL 2.1 XML invoice content
+            invoice_xml: UBL 2.1 XML invoice content (may be None when invoice_b64 is given)
             invoice_hash: SHA256 hash of the invoice (calculated if not provided)
+            invoice_b64: Already base64-encoded XML, sent as-is instead of re-encoding
             
         Returns:
-            Response from clearance API including cleared invoice
+            Response from reporting API
         """
         
-        logger.info("Clearing standard invoice")
+        logger.debug("Reporting simplified invoice")
         
-        # Calculate hash if not provided
-        if not invoice_hash:
-            invoice_hash = hashlib.sha256(invoice_xml.encode('utf-8')).hexdigest()
+        # Use production CSID if available, otherwise compliance CSID
+        auth_cert = self.production_csid or self.compliance_csid
         
-        # Encode invoice in base64
-        invoice_b64 = base64.b64encode(invoice_xml.encode('utf-8')).decode('utf-8')
+        if not auth_cert:
+            return {
+                "success": False,
+                "error": "Authentication certificate required. Complete onboarding first."
+            }
         
-        payload = {
-            "invoiceHash": invoice_hash,
-            "invoice": invoice_b64
-        }
+        return await self._submit_xml(
+            "/invoices/reporting/single", "reporting", "reported",
+            auth_cert, invoice_xml, invoice_hash, invoice_b64
+        )
+    
+    async def report_invoices(self,
+                              entries: List[Tuple[str, Optional[str]]],
+                              concurrency: int = 16) -> List[Dict]:
+        """
+        Report many simplified invoices over the pooled HTTP/2 connection
+        
+        Args:
+            entries: (invoice_xml, invoice_hash) pairs; a None hash is calculated
+            concurrency: Maximum number of reports in flight at once
+            
+        Returns:
+            One report_invoice result per entry, in the same order
+        """
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _report_one(invoice_xml: str, invoice_hash: Optional[str]) -> Dict:
+            async with semaphore:
+                return await self.report_invoice(invoice_xml, invoice_hash)
+        
+        results = list(await asyncio.gather(*(_report_one(xml, h) for xml, h in entries)))
+        
+        logger.info(
+            "Invoice batch reported",
+            count=len(results),
+            failures=sum(1 for r in results if not r["success"])
+        )
+        
+        return results
+    
+    async def clear_invoice(self, 
+                          invoice_xml: Optional[str], 
+                          invoice_hash: Optional[str] = None,
+                          invoice_b64: Optional[str] = None) -> Dict:
+        """
+        Clear standard invoice with ZATCA
+        
+        Args:
+            invoice_xml: UBL 2.1 XML invoice content (may be None when invoice_b64 is given)
+            invoice_hash: SHA256 hash of the invoice (calculated if not provided)
+            invoice_b64: Already base64-encoded XML, sent as-is instead of re-encoding
+            
+        Returns:
+            Response from clearance API including cleared invoice
+        """
+        
+        logger.debug("Clearing standard invoice")
         
         # Use production CSID for clearance
         auth_cert = self.production_csid
@@ -411,49 +530,11 @@ class ZATCAAPIClient:
                 "error": "Production CSID required for invoice clearance."
             }
         
-        try:
-            response = await self._make_request(
-                "POST", 
-                "/invoices/clearance/single", 
-                data=payload,
-                auth_cert=auth_cert
-            )
-            
-            if response.status_code in [200, 202]:
-                result = response.json()
-                
-                logger.info(
-                    "Invoice cleared successfully",
-                    status=result.get("status"),
-                    invoice_hash=result.get("invoiceHash")
-                )
-                
-                return {
-                    "success": True,
-                    "status": result.get("status"),
-                    "invoice_hash": result.get("invoiceHash"),
-                    "cleared_invoice": result.get("clearedInvoice"),
-                    "qr_code": result.get("qrCode"),
-                    "warnings": result.get("warnings"),
-                    "errors": result.get("errors"),
-                    "response": result
-                }
-            else:
-                error_msg = f"HTTP {response.status_code}: {response.text}"
-                logger.error("Invoice clearance failed", error=error_msg)
-                
-                return {
-                    "success": False,
-                    "error": error_msg,
-                    "status_code": response.status_code
-                }
-                
-        except Exception as e:
-            logger.error("Invoice clearance exception", error=str(e))
-            return {
-                "success": False,
-                "error": str(e)
-            }
+        return await self._submit_xml(
+            "/invoices/clearance/single", "clearance", "cleared",
+            auth_cert, invoice_xml, invoice_hash, invoice_b64,
+            extra_fields={"cleared_invoice": "clearedInvoice", "qr_code": "qrCode"}
+        )
     
     async def renew_certificate(self, csr: str, otp: str) -> Dict:
         """
@@ -487,6 +568,31 @@ class ZATCAAPIClient:
             "error": production_result.get("error")
         }
     
+    async def renew_certificates_bulk(self,
+                                      specs: List[Tuple[str, str]],
+                                      concurrency: int = 8) -> List[Dict]:
+        """
+        Renew certificates for several EGS units concurrently
+        
+        Each renewal runs on its own forked client, so the units' CSIDs never mix and this
+        client's own onboarding state is left untouched.
+        
+        Args:
+            specs: (csr, otp) pairs, one per EGS unit
+            concurrency: Maximum number of renewals in flight at once
+            
+        Returns:
+            One renew_certificate result per spec, in the same order
+        """
+        
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _renew_one(csr: str, otp: str) -> Dict:
+            async with semaphore:
+                return await self._fork().renew_certificate(csr, otp)
+        
+        return list(await asyncio.gather(*(_renew_one(csr, otp) for csr, otp in specs)))
+    
     async def validate_invoice(self, invoice_xml: str) -> Dict:
         """
         Validate invoice XML against ZATCA requirements
@@ -501,19 +607,11 @@ class ZATCAAPIClient:
         logger.info("Validating invoice XML")
         
         # Basic XML structure validation
+        found = set(_VALIDATION_RE.findall(invoice_xml))
         validation_checks = {
-            "has_xml_declaration": invoice_xml.strip().startswith('<?xml'),
-            "has_invoice_root": '<Invoice' in invoice_xml,
-            "has_customization_id": 'BR-KSA-CB' in invoice_xml,
-            "has_profile_id": 'reporting:1.0' in invoice_xml,
-            "has_ubl_namespace": 'urn:oasis:names:specification:ubl:schema:xsd:Invoice-2' in invoice_xml,
-            "has_vat_calculation": '<cbc:Percent>' in invoice_xml,
-            "has_currency_sar": 'currencyID="SAR"' in invoice_xml,
-            "has_supplier_info": '<cac:AccountingSupplierParty>' in invoice_xml,
-            "has_customer_info": '<cac:AccountingCustomerParty>' in invoice_xml,
-            "has_tax_total": '<cac:TaxTotal>' in invoice_xml,
-            "has_monetary_total": '<cac:LegalMonetaryTotal>' in invoice_xml,
-            "has_invoice_lines": '<cac:InvoiceLine>' in invoice_xml,
+            # Anchored match: no stripped copy of the document is made
+            "has_xml_declaration": _XML_DECLARATION_RE.match(invoice_xml) is not None,
+            **{name: needle in found for name, needle in _VALIDATION_CHECKS.items()},
             "well_formed": invoice_xml.count('<') == invoice_xml.count('>')
         }
         
@@ -530,9 +628,18 @@ class ZATCAAPIClient:
         }
     
     def get_api_status(self) -> Dict:
-        """Get current API client status"""
+        """
+        Get current API client status
         
-        return {
+        The snapshot is cached for STATUS_CACHE_TTL seconds (and rebuilt as soon as a CSID
+        is generated); every caller gets its own copy of it.
+        """
+        
+        now = time.monotonic()
+        if self._status_cache is not None and now - self._status_cache[0] < STATUS_CACHE_TTL:
+            return dict(self._status_cache[1])
+        
+        status = {
             "sandbox_mode": self.sandbox_mode,
             "base_url": self.base_url,
             "has_compliance_csid": bool(self.compliance_csid),
@@ -543,12 +650,35 @@ class ZATCAAPIClient:
             "ready_for_reporting": bool(self.compliance_csid or self.production_csid),
             "ready_for_clearance": bool(self.production_csid)
         }
+        self._status_cache = (now, status)
+        return dict(status)
+
+
+_INVOICE_TYPE_DESCRIPTIONS = MappingProxyType({
+    "1000": "Standard invoices only",
+    "0100": "Simplified invoices only", 
+    "1100": "Standard and Simplified invoices",
+    "0010": "Buyer QR code only",
+    "0001": "Seller QR code only",
+    "1111": "All invoice types supported"
+})
+
+
+def _freeze(value):
+    """Recursively make a dict/list structure read-only so a cached result can be shared"""
+    
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
 
 
 class ZATCAOnboardingHelper:
     """Helper class for ZATCA onboarding process"""
     
     @staticmethod
+    @lru_cache(maxsize=256)
     def generate_csr_config(
         common_name: str,
         organization_name: str,
@@ -557,7 +687,7 @@ class ZATCAOnboardingHelper:
         invoice_type: str = "1100",  # Standard and Simplified
         location: str = "Riyadh",
         industry: str = "Retail"
-    ) -> Dict:
+    ) -> Mapping:
         """
         Generate CSR configuration according to ZATCA requirements
         
@@ -571,10 +701,10 @@ class ZATCAOnboardingHelper:
             industry: Industry sector
             
         Returns:
-            CSR configuration dictionary
+            Read-only CSR configuration mapping (cached and shared between equal calls)
         """
         
-        return {
+        return _freeze({
             "subject": {
                 "country_name": "SA",
                 "organization_name": organization_name,
@@ -601,7 +731,7 @@ class ZATCAOnboardingHelper:
             "extended_key_usage": [
                 "client_auth"
             ]
-        }
+        })
     
     @staticmethod
     def validate_invoice_type(invoice_type: str) -> bool:
@@ -627,7 +757,8 @@ class ZATCAOnboardingHelper:
         return True
     
     @staticmethod
-    def decode_invoice_type(invoice_type: str) -> Dict:
+    @lru_cache(maxsize=256)
+    def decode_invoice_type(invoice_type: str) -> Mapping:
         """
         Decode invoice type functionality map
         
@@ -635,23 +766,16 @@ class ZATCAOnboardingHelper:
             invoice_type: 4-digit binary string
             
         Returns:
-            Dictionary with supported invoice types
+            Read-only mapping with supported invoice types (cached per invoice_type)
         """
         
         if len(invoice_type) != 4:
-            return {"error": "Invalid invoice type format"}
+            return MappingProxyType({"error": "Invalid invoice type format"})
         
-        return {
+        return MappingProxyType({
             "standard_invoices": invoice_type[0] == "1",  # T
             "simplified_invoices": invoice_type[1] == "1",  # S
             "buyer_qr_code": invoice_type[2] == "1",  # C
             "seller_qr_code": invoice_type[3] == "1",  # Z
-            "description": {
-                "1000": "Standard invoices only",
-                "0100": "Simplified invoices only", 
-                "1100": "Standard and Simplified invoices",
-                "0010": "Buyer QR code only",
-                "0001": "Seller QR code only",
-                "1111": "All invoice types supported"
-            }.get(invoice_type, "Custom configuration")
-        }
\ No newline at end of file
+            "description": _INVOICE_TYPE_DESCRIPTIONS.get(invoice_type, "Custom configuration")
+        })
\ No newline at end of file
@@ -3,32 +3,148 @@ ZATCA Production API Integration Service
 Handles real ZATCA API communication with client certificates and OAuth2 authentication
 """
 
-import base64
+import hashlib
+import logging
 import ssl
 import asyncio
+import time
+from urllib.parse import urlencode
 from datetime import datetime, timedelta
-from typing import Dict, Optional, Tuple
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple
 import tempfile
 import os
 
 import httpx
+import orjson
 import structlog
 from cryptography import x509
 from cryptography.hazmat.primitives import serialization
 
+try:
+    # SIMD-accelerated base64 with the same API as the stdlib module
+    import pybase64 as base64
+except ImportError:
+    import base64
+
 from src.core.config import Config
 
 logger = structlog.get_logger(__name__)
 
+# Seconds before a token's expiry at which it is no longer used and a new one is requested
+TOKEN_REFRESH_MARGIN = 300
+
+# Invariant request headers; each call only adds Authorization (and the invoice UUID)
+_SUBMIT_HEADERS = MappingProxyType({
+    "Content-Type": "application/json",
+    "Accept": "application/json"
+})
+_STATUS_HEADERS = MappingProxyType({
+    "Accept": "application/json"
+})
+
+# Simulation-mode (no ZATCA_ENDPOINT) results; only per-call fields are added to the shared parts
+_SIM_SUBMIT_FIELDS = MappingProxyType({
+    "success": True,
+    "status": "ACCEPTED",
+    "message": "Invoice submitted successfully (simulation)",
+    "simulation": True
+})
+_SIM_STATUS_RESPONSE = MappingProxyType({
+    "success": True,
+    "status": "ACCEPTED",
+    "message": "Simulation mode",
+    "simulation": True
+})
+_SIM_HEALTH_FIELDS = MappingProxyType({
+    "status": "simulation",
+    "message": "ZATCA endpoint not configured - running in simulation mode"
+})
+
+# Bytes of a non-JSON response body kept (decoded) in a submission result
+RAW_RESPONSE_LIMIT = 4096
+
+# Characters of a response body or payload echoed into a log record
+LOG_FIELD_LIMIT = 2048
+
+# OAuth2 tokens shared by every service instance in the process: (access_token, refresh_at) keyed
+# by _token_cache_key(), so rebuilding the service does not trigger a new token request.
+# refresh_at is on the time.monotonic() clock, so wall-clock jumps do not affect token reuse.
+_token_cache: Dict[str, Tuple[str, float]] = {}
+
+
+def _token_cache_key() -> str:
+    """Cache key for the configured endpoint and client, without keeping the client ID in clear"""
+    return hashlib.sha256(f"{Config.ZATCA_ENDPOINT}|{Config.ZATCA_CLIENT_ID}".encode()).hexdigest()
+
+
+# (epoch second, formatted timestamp) of the last _utc_timestamp() call
+_timestamp_cache: Tuple[int, str] = (-1, "")
+
+
+def _utc_timestamp() -> str:
+    """ISO 8601 UTC timestamp at one-second resolution, formatted at most once per second"""
+    global _timestamp_cache
+    now = int(time.time())
+    if _timestamp_cache[0] != now:
+        _timestamp_cache = (now, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(now)))
+    return _timestamp_cache[1]
+
+
+def _jwt_expires_in(token: str) -> Optional[float]:
+    """Seconds until a JWT access token's exp claim, or None if the token is not a readable JWT.
+
+    Only the payload is decoded (no signature check): the gateway validates the token, this just
+    reads when it will stop accepting it.
+    """
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    payload = parts[1]
+    try:
+        claims = orjson.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"]) - time.time()
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+def _parse_response(response: httpx.Response) -> Dict:
+    """Decode a JSON response once; any other (or malformed) body is kept as a bounded raw_response"""
+    if "json" in response.headers.get("content-type", ""):
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass
+    return {"raw_response": response.content[:RAW_RESPONSE_LIMIT].decode("utf-8", "replace")}
+
+
+def _truncate(value, limit: int = LOG_FIELD_LIMIT) -> str:
+    """Render a response body (bytes) or parsed payload as a bounded string for logging"""
+    raw = value if isinstance(value, bytes) else orjson.dumps(value)
+    return raw[:limit].decode("utf-8", "replace")
+
 
 class ZATCAProductionService:
     """Production ZATCA API integration with client certificate authentication"""
     
     def __init__(self):
         self.access_token: Optional[str] = None
-        self.token_expires_at: Optional[datetime] = None
-        self.client_cert_path: Optional[str] = None
-        self.private_key_path: Optional[str] = None
+        # 0.0 whenever there is no token, so "refresh time not reached" alone means "token usable"
+        self._token_refresh_at: float = 0.0
+        self._ssl_context: Optional[ssl.SSLContext] = None
+        self._client: Optional[httpx.AsyncClient] = None
+        self._auth_lock = asyncio.Lock()
+        # Endpoint-derived strings are fixed for the process; build them once rather than per request
+        self._token_key = _token_cache_key()
+        self._auth_url = f"{Config.ZATCA_ENDPOINT}/oauth2/token" if Config.ZATCA_ENDPOINT else None
+        self._submit_url = f"{Config.ZATCA_ENDPOINT}/invoices" if Config.ZATCA_ENDPOINT else None
+        # The client-credentials grant never changes for the process, so it is urlencoded once
+        self._auth_body = urlencode({
+            "grant_type": "client_credentials",
+            "client_id": Config.ZATCA_CLIENT_ID,
+            "client_secret": Config.ZATCA_CLIENT_SECRET,
+            "scope": "InvoiceSubmission"
+        }).encode("ascii")
         self._setup_certificates()
     
     def _setup_certificates(self):
@@ -42,18 +158,15 @@ class ZATCAProductionService:
             cert_pem = base64.b64decode(Config.ZATCA_CERT_B64)
             key_pem = base64.b64decode(Config.ZATCA_PRIVATE_KEY_B64)
             
-            # Create temporary files for certificates
-            cert_temp = tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.pem')
-            key_temp = tempfile.NamedTemporaryFile(mode='wb', delete=False, suffix='.pem')
-            
-            cert_temp.write(cert_pem)
-            key_temp.write(key_pem)
-            
-            cert_temp.close()
-            key_temp.close()
-            
-            self.client_cert_path = cert_temp.name
-            self.private_key_path = key_temp.name
+            # Build the SSL context with the client certificate once; the pooled client reuses it.
+            # load_cert_chain only reads from a path, so the PEM lives in a private (0700) temp
+            # directory just for the load and is removed before this method returns.
+            self._ssl_context = ssl.create_default_context()
+            with tempfile.TemporaryDirectory() as cert_dir:
+                chain_path = os.path.join(cert_dir, "client.pem")
+                with open(chain_path, "wb") as f:
+                    f.write(key_pem + b"\n" + cert_pem)
+                self._ssl_context.load_cert_chain(chain_path)
             
             logger.info("ZATCA certificates loaded successfully")
             
@@ -61,106 +174,146 @@ class ZATCAProductionService:
             logger.error("Failed to setup ZATCA certificates", error=str(e))
             raise
     
-    def _cleanup_certificates(self):
-        """Clean up temporary certificate files"""
-        try:
-            if self.client_cert_path and os.path.exists(self.client_cert_path):
-                os.unlink(self.client_cert_path)
-            if self.private_key_path and os.path.exists(self.private_key_path):
-                os.unlink(self.private_key_path)
-        except Exception as e:
-            logger.warning("Failed to cleanup certificate files", error=str(e))
+    async def __aenter__(self) -> "ZATCAProductionService":
+        self._get_client()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.aclose()
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Return the service's pooled HTTP client (with SSL configuration), creating it on first use"""
+        if self._client is None:
+            # Without certificates (simulation) the default verification is used
+            self._client = httpx.AsyncClient(
+                verify=self._ssl_context or True,
+                timeout=30.0,
+                # Concurrent submissions multiplex over one connection when the gateway negotiates h2
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            )
+        return self._client
     
-    def __del__(self):
-        """Cleanup certificates on object destruction"""
-        self._cleanup_certificates()
+    async def aclose(self):
+        """Close the pooled HTTP client (a new one is opened on the next request)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
     
-    async def _get_http_client(self) -> httpx.AsyncClient:
-        """Create HTTP client with SSL configuration"""
-        if not self.client_cert_path or not self.private_key_path:
-            # No certificates - use regular client for simulation
-            return httpx.AsyncClient(timeout=30.0)
+    def _valid_token(self) -> Optional[str]:
+        """Return a token valid for at least 5 more minutes, or None if a new one is needed"""
         
-        # Create SSL context with client certificate
-        ssl_context = ssl.create_default_context()
-        ssl_context.load_cert_chain(self.client_cert_path, self.private_key_path)
+        now = time.monotonic()
+        if now < self._token_refresh_at:
+            return self.access_token
         
-        return httpx.AsyncClient(
-            verify=ssl_context,
-            timeout=30.0
-        )
+        # Pick up a token another instance in this process has already fetched
+        cached = _token_cache.get(self._token_key)
+        if cached is not None and now < cached[1]:
+            self.access_token, self._token_refresh_at = cached
+            return self.access_token
+        return None
     
     async def authenticate(self) -> str:
         """Authenticate with ZATCA OAuth2 and get access token"""
         
-        # Check if we have a valid token
-        if (self.access_token and self.token_expires_at and 
-            datetime.utcnow() < self.token_expires_at - timedelta(minutes=5)):
+        # Fast path: one float comparison against the sentinel-initialized refresh time
+        if time.monotonic() < self._token_refresh_at:
             return self.access_token
         
+        token = self._valid_token()
+        if token is not None:
+            return token
+        
+        # Only one coroutine requests a token; the others wait here and then reuse it
+        async with self._auth_lock:
+            token = self._valid_token()
+            if token is not None:
+                return token
+            return await self._request_token()
+    
+    async def _request_token(self) -> str:
+        """Request a new access token from the ZATCA OAuth2 endpoint"""
+        
         if not Config.ZATCA_ENDPOINT:
             raise ValueError("ZATCA_ENDPOINT not configured")
         
         if not Config.ZATCA_CLIENT_ID or not Config.ZATCA_CLIENT_SECRET:
             raise ValueError("ZATCA client credentials not configured")
         
-        auth_url = f"{Config.ZATCA_ENDPOINT}/oauth2/token"
+        logger.info("Authenticating with ZATCA", endpoint=self._auth_url)
         
-        auth_data = {
-            "grant_type": "client_credentials",
-            "client_id": Config.ZATCA_CLIENT_ID,
-            "client_secret": Config.ZATCA_CLIENT_SECRET,
-            "scope": "InvoiceSubmission"
-        }
-        
-        logger.info("Authenticating with ZATCA", endpoint=auth_url)
-        
-        async with await self._get_http_client() as client:
-            try:
-                response = await client.post(
-                    auth_url,
-                    data=auth_data,
-                    headers={"Content-Type": "application/x-www-form-urlencoded"}
+        try:
+            response = await self._get_client().post(
+                self._auth_url,
+                content=self._auth_body,
+                headers={"Content-Type": "application/x-www-form-urlencoded"}
+            )
+            
+            if response.status_code == 200:
+                token_data = orjson.loads(response.content)
+                self.access_token = token_data["access_token"]
+                
+                # Calculate token expiry (default to 1 hour if not provided); a JWT's own exp
+                # claim wins when it is earlier, e.g. for a token issued before a clock skew
+                expires_in = token_data.get("expires_in", 3600)
+                jwt_expires_in = _jwt_expires_in(self.access_token)
+                if jwt_expires_in is not None:
+                    expires_in = min(expires_in, jwt_expires_in)
+                self._token_refresh_at = time.monotonic() + expires_in - TOKEN_REFRESH_MARGIN
+                _token_cache[self._token_key] = (self.access_token, self._token_refresh_at)
+                
+                logger.info(
+                    "ZATCA authentication successful",
+                    expires_in=expires_in,
+                    expires_at=(datetime.utcnow() + timedelta(seconds=expires_in)).isoformat()
                 )
                 
-                if response.status_code == 200:
-                    token_data = response.json()
-                    self.access_token = token_data["access_token"]
-                    
-                    # Calculate token expiry (default to 1 hour if not provided)
-                    expires_in = token_data.get("expires_in", 3600)
-                    self.token_expires_at = datetime.utcnow() + timedelta(seconds=expires_in)
-                    
-                    logger.info(
-                        "ZATCA authentication successful",
-                        expires_in=expires_in,
-                        expires_at=self.token_expires_at.isoformat()
-                    )
-                    
-                    return self.access_token
-                else:
-                    error_msg = f"Authentication failed: HTTP {response.status_code} - {response.text}"
-                    logger.error("ZATCA authentication failed", 
-                               status_code=response.status_code,
-                               response=response.text)
-                    raise Exception(error_msg)
-                    
-            except httpx.TimeoutException:
-                error_msg = "ZATCA authentication timeout"
-                logger.error(error_msg)
+                return self.access_token
+            else:
+                body = _truncate(response.content)
+                error_msg = f"Authentication failed: HTTP {response.status_code} - {body}"
+                logger.error("ZATCA authentication failed", 
+                           status_code=response.status_code,
+                           response=body)
                 raise Exception(error_msg)
-            except Exception as e:
-                logger.error("ZATCA authentication error", error=str(e))
-                raise
+                
+        except httpx.TimeoutException:
+            error_msg = "ZATCA authentication timeout"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+        except Exception as e:
+            logger.error("ZATCA authentication error", error=str(e))
+            raise
     
-    async def submit_invoice(self, invoice_xml: str, invoice_hash: str, invoice_uuid: str) -> Dict:
+    def invalidate_token(self, token: Optional[str] = None):
+        """Forget the current access token, in this instance and in the process-wide cache.
+
+        With `token`, only that token is dropped: when a concurrent request has already replaced
+        it, the newer token is kept rather than thrown away.
+        """
+        if token is None or self.access_token == token:
+            self.access_token = None
+            self._token_refresh_at = 0.0
+        cached = _token_cache.get(self._token_key)
+        if cached is not None and (token is None or cached[0] == token):
+            del _token_cache[self._token_key]
+    
+    async def submit_invoice(
+        self,
+        invoice_xml: Optional[str],
+        invoice_hash: str,
+        invoice_uuid: str,
+        invoice_b64: Optional[str] = None
+    ) -> Dict:
         """
         Submit invoice to ZATCA API
         
         Args:
-            invoice_xml: UBL 2.1 XML invoice content
+            invoice_xml: UBL 2.1 XML invoice content (may be None when invoice_b64 is given)
             invoice_hash: SHA256 hash of the XML
             invoice_uuid: Unique invoice identifier
+            invoice_b64: Already base64-encoded XML (e.g. Invoice.zatca_xml), sent as-is
             
         Returns:
             Dict with submission result
@@ -170,90 +323,88 @@ class ZATCAProductionService:
             # Simulation mode
             logger.info("ZATCA simulation mode - invoice not actually submitted",
                        invoice_uuid=invoice_uuid)
-            return {
-                "success": True,
-                "zatca_uuid": f"sim_{invoice_uuid}",
-                "status": "ACCEPTED",
-                "message": "Invoice submitted successfully (simulation)",
-                "simulation": True
-            }
+            return {**_SIM_SUBMIT_FIELDS, "zatca_uuid": f"sim_{invoice_uuid}"}
         
         try:
             # Get access token
             access_token = await self.authenticate()
             
-            # Prepare submission URL
-            submission_url = f"{Config.ZATCA_ENDPOINT}/invoices"
-            
             # Prepare headers
             headers = {
+                **_SUBMIT_HEADERS,
                 "Authorization": f"Bearer {access_token}",
-                "Content-Type": "application/json",
-                "Accept": "application/json",
                 "X-Invoice-UUID": invoice_uuid
             }
             
-            # Prepare payload
-            payload = {
-                "invoiceXml": base64.b64encode(invoice_xml.encode('utf-8')).decode('utf-8'),
-                "invoiceHash": invoice_hash,
-                "invoiceUuid": invoice_uuid,
-                "submissionType": "production"
-            }
+            # Prepare payload as JSON bytes: freshly encoded base64 needs no JSON escaping, so it is
+            # spliced in without becoming a str, and httpx sends the body without re-serializing it
+            if invoice_b64:
+                invoice_field = orjson.dumps(invoice_b64)
+            else:
+                invoice_field = b'"' + base64.b64encode(invoice_xml.encode('utf-8')) + b'"'
+            payload = b''.join((
+                b'{"invoiceXml":', invoice_field,
+                b',"invoiceHash":', orjson.dumps(invoice_hash),
+                b',"invoiceUuid":', orjson.dumps(invoice_uuid),
+                b',"submissionType":"production"}'
+            ))
             
             logger.info(
                 "Submitting invoice to ZATCA",
                 invoice_uuid=invoice_uuid,
-                endpoint=submission_url,
-                xml_length=len(invoice_xml)
+                endpoint=self._submit_url,
+                xml_length=len(invoice_xml) if invoice_xml is not None else None
             )
             
-            async with await self._get_http_client() as client:
-                response = await client.post(
-                    submission_url,
-                    json=payload,
-                    headers=headers
-                )
-                
-                response_data = {}
-                try:
-                    response_data = response.json()
-                except:
-                    response_data = {"raw_response": response.text}
-                
-                if response.status_code in [200, 201, 202]:
+            response = await self._get_client().post(self._submit_url, content=payload, headers=headers)
+            
+            if response.status_code == 401:
+                # The token was revoked or expired early: drop it (unless another request already
+                # has) and retry once; authenticate() lets a single coroutine fetch the new token
+                self.invalidate_token(access_token)
+                headers["Authorization"] = f"Bearer {await self.authenticate()}"
+                response = await self._get_client().post(self._submit_url, content=payload, headers=headers)
+            
+            response_data = _parse_response(response)
+            
+            if response.status_code in [200, 201, 202]:
+                # Serializing the response for the log only pays off when the record is emitted
+                if logger.is_enabled_for(logging.INFO):
                     logger.info(
                         "Invoice submitted successfully to ZATCA",
                         invoice_uuid=invoice_uuid,
                         status_code=response.status_code,
-                        zatca_response=response_data
+                        zatca_response=_truncate(response_data)
                     )
-                    
-                    return {
-                        "success": True,
-                        "zatca_uuid": response_data.get("invoiceUuid", invoice_uuid),
-                        "status": response_data.get("status", "ACCEPTED"),
-                        "message": response_data.get("message", "Invoice submitted successfully"),
-                        "response_data": response_data,
-                        "simulation": False
-                    }
-                else:
-                    error_msg = f"ZATCA submission failed: HTTP {response.status_code}"
-                    logger.error(
-                        "Invoice submission failed",
-                        invoice_uuid=invoice_uuid,
-                        status_code=response.status_code,
-                        response=response_data
-                    )
-                    
-                    return {
-                        "success": False,
-                        "error": error_msg,
-                        "status_code": response.status_code,
-                        "response_data": response_data,
-                        "zatca_errors": response_data.get("errors", []),
-                        "simulation": False
-                    }
+                
+                # Optional fields fall back to defaults, so these stay dict.get lookups (an
+                # itemgetter would raise on a missing key); the bound method is looked up once
+                get = response_data.get
+                return {
+                    "success": True,
+                    "zatca_uuid": get("invoiceUuid", invoice_uuid),
+                    "status": get("status", "ACCEPTED"),
+                    "message": get("message", "Invoice submitted successfully"),
+                    "response_data": response_data,
+                    "simulation": False
+                }
+            else:
+                error_msg = f"ZATCA submission failed: HTTP {response.status_code}"
+                logger.error(
+                    "Invoice submission failed",
+                    invoice_uuid=invoice_uuid,
+                    status_code=response.status_code,
+                    response=_truncate(response_data)
+                )
+                
+                return {
+                    "success": False,
+                    "error": error_msg,
+                    "status_code": response.status_code,
+                    "response_data": response_data,
+                    "zatca_errors": response_data.get("errors", []),
+                    "simulation": False
+                }
                     
         except Exception as e:
             logger.error(
@@ -269,7 +420,32 @@ class ZATCAProductionService:
                 "simulation": False
             }
     
-    async def get_invoice_status(self, zatca_uuid: str) -> Dict:
+    async def submit_invoices_batch(
+        self,
+        invoices: List[Tuple],
+        max_concurrency: int = 16
+    ) -> List[Dict]:
+        """
+        Submit many invoices concurrently over the pooled HTTP client
+        
+        Args:
+            invoices: submit_invoice argument tuples, i.e. (invoice_xml, invoice_hash, invoice_uuid)
+                      or (None, invoice_hash, invoice_uuid, invoice_b64)
+            max_concurrency: Maximum number of submissions in flight at once (ZATCA rate caps)
+            
+        Returns:
+            One submit_invoice result per entry, in the same order
+        """
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def _submit_one(args: Tuple) -> Dict:
+            async with semaphore:
+                return await self.submit_invoice(*args)
+        
+        return list(await asyncio.gather(*(_submit_one(args) for args in invoices)))
+    
+    async def get_invoice_status(self, zatca_uuid: str) -> Mapping:
         """
         Get invoice status from ZATCA
         
@@ -277,46 +453,37 @@ class ZATCAProductionService:
             zatca_uuid: ZATCA invoice UUID
             
         Returns:
-            Dict with invoice status
+            Dict with invoice status (a shared read-only mapping in simulation mode)
         """
         
         if not Config.ZATCA_ENDPOINT:
-            return {
-                "success": True,
-                "status": "ACCEPTED",
-                "message": "Simulation mode",
-                "simulation": True
-            }
+            return _SIM_STATUS_RESPONSE
         
         try:
             access_token = await self.authenticate()
             
-            status_url = f"{Config.ZATCA_ENDPOINT}/invoices/{zatca_uuid}/status"
+            status_url = f"{self._submit_url}/{zatca_uuid}/status"
             
-            headers = {
-                "Authorization": f"Bearer {access_token}",
-                "Accept": "application/json"
-            }
+            headers = {**_STATUS_HEADERS, "Authorization": f"Bearer {access_token}"}
+            
+            response = await self._get_client().get(status_url, headers=headers)
             
-            async with await self._get_http_client() as client:
-                response = await client.get(status_url, headers=headers)
+            if response.status_code == 200:
+                status_data = orjson.loads(response.content)
+                return {
+                    "success": True,
+                    "status": status_data.get("status"),
+                    "message": status_data.get("message"),
+                    "data": status_data,
+                    "simulation": False
+                }
+            else:
+                return {
+                    "success": False,
+                    "error": f"Status check failed: HTTP {response.status_code}",
+                    "simulation": False
+                }
                 
-                if response.status_code == 200:
-                    status_data = response.json()
-                    return {
-                        "success": True,
-                        "status": status_data.get("status"),
-                        "message": status_data.get("message"),
-                        "data": status_data,
-                        "simulation": False
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": f"Status check failed: HTTP {response.status_code}",
-                        "simulation": False
-                    }
-                    
         except Exception as e:
             return {
                 "success": False,
@@ -333,11 +500,7 @@ class ZATCAProductionService:
         """
         
         if not Config.ZATCA_ENDPOINT:
-            return {
-                "status": "simulation",
-                "message": "ZATCA endpoint not configured - running in simulation mode",
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            return {**_SIM_HEALTH_FIELDS, "timestamp": _utc_timestamp()}
         
         try:
             # Try to authenticate
@@ -348,7 +511,7 @@ class ZATCAProductionService:
                 "message": "ZATCA API is accessible and authentication successful",
                 "endpoint": Config.ZATCA_ENDPOINT,
                 "authenticated": True,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _utc_timestamp()
             }
             
         except Exception as e:
@@ -358,7 +521,7 @@ class ZATCAProductionService:
                 "endpoint": Config.ZATCA_ENDPOINT,
                 "authenticated": False,
                 "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": _utc_timestamp()
             }
 
 
@@ -373,4 +536,16 @@ def get_zatca_service() -> ZATCAProductionService:
     if _zatca_service_instance is None:
         _zatca_service_instance = ZATCAProductionService()
     
-    return _zatca_service_instance
\ No newline at end of file
+    return _zatca_service_instance
+
+
+async def init_zatca_service() -> ZATCAProductionService:
+    """Create the singleton on a worker thread, so certificate loading and SSL context setup
+    (CA bundle reads, PEM parsing) happen at startup without blocking the event loop"""
+    return await asyncio.to_thread(get_zatca_service)
+
+
+async def close_zatca_service() -> None:
+    """Close the singleton's pooled HTTP client, if the service was ever created"""
+    if _zatca_service_instance is not None:
+        await _zatca_service_instance.aclose()
\ No newline at end of file
@@ -0,0 +1,5 @@
+import os
+
+# src.core.config reads these at import time; the tests below never open a connection
+os.environ.setdefault("DB_URL", "sqlite+aiosqlite:///:memory:")
+os.environ.setdefault("JWT_SECRET", "test-secret")
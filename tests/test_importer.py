@@ -0,0 +1,29 @@
+from decimal import Decimal
+
+from src.services.csv_reader import read_csv
+from src.services.importer import ENTRIES_CSV, TWOPLACES, _account_entries, _money
+
+
+def test_blank_item_amount_imports_as_zero(tmp_path):
+    entries = tmp_path / "EntryTab.csv"
+    entries.write_text("AccNo,AmntDB,ItemNo,ItemAmnt,ItemCont\n1,10.5,7,,2\n2,3.0,8,4.5,1\n", encoding="utf-8")
+
+    first = read_csv(str(entries), columns=["AccNo", "AmntDB", "ItemNo", "ItemAmnt", "ItemCont"]).iloc[0]
+
+    assert _money(first.get("ItemAmnt")) == Decimal("0.00")
+
+
+def test_money_rounds_to_cents():
+    assert _money(12.346) == Decimal("12.35")
+    assert _money(None) == Decimal("0.00")
+    assert _money(0) == Decimal("0.00")
+
+
+def test_account_entries_keep_per_account_scan_values():
+    entries_df = read_csv(ENTRIES_CSV, columns=["AccNo", "AmntDB", "ItemNo", "ItemAmnt", "ItemCont"])
+    acc_sum, acc_first = _account_entries(entries_df)
+
+    # Account 2010105 is invoiced as RecNo 1691 at a 7% ratio
+    first = acc_first[2010105]
+    assert str(first.get("ItemNo", "")) == "28.0"
+    assert Decimal(float(acc_sum[2010105]) * (7.0 / 100.0)).quantize(TWOPLACES) == Decimal("130.44")
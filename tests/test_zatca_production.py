@@ -0,0 +1,48 @@
+import asyncio
+
+import httpx
+import orjson
+
+from src.services import zatca_production
+from src.services.zatca_production import Config, ZATCAProductionService
+
+
+def _service(monkeypatch, handler) -> ZATCAProductionService:
+    monkeypatch.setattr(Config, "ZATCA_ENDPOINT", "https://zatca.test")
+    monkeypatch.setattr(Config, "ZATCA_CLIENT_ID", "client")
+    monkeypatch.setattr(Config, "ZATCA_CLIENT_SECRET", "secret")
+    monkeypatch.setattr(zatca_production, "_token_cache", {})
+    service = ZATCAProductionService()
+    service._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return service
+
+
+def test_token_revoked_during_batch_is_refreshed_once(monkeypatch):
+    issued = []
+    revoked = set()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/oauth2/token":
+            issued.append(f"token-{len(issued) + 1}")
+            return httpx.Response(200, json={"access_token": issued[-1], "expires_in": 3600})
+        # Stagger the replies so some 401s for the revoked token arrive after the refresh
+        await asyncio.sleep(0.001 * (int(request.headers["X-Invoice-UUID"]) % 4))
+        if request.headers["Authorization"].removeprefix("Bearer ") in revoked:
+            return httpx.Response(401)
+        return httpx.Response(202, json={"status": "ACCEPTED"})
+
+    async def run():
+        service = _service(monkeypatch, handler)
+        await service.authenticate()
+        revoked.add(issued[0])
+        invoices = [(None, "hash", str(i), "PGludm9pY2UvPg==") for i in range(16)]
+        try:
+            return await service.submit_invoices_batch(invoices)
+        finally:
+            await service.aclose()
+
+    results = asyncio.run(run())
+
+    assert all(result["success"] for result in results), orjson.dumps(results)
+    # The initial token plus a single refresh after the revocation
+    assert len(issued) == 2